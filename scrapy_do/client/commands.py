@@ -113,12 +113,21 @@ def list_jobs_arg_setup(subparsers):
                         help='job status of the jobs to list')
     parser.add_argument('--job-id', type=str, default=None,
                         help='ID of the job to list')
+    parser.add_argument('--limit', type=int, default=None,
+                        help='maximum number of jobs to list')
+    parser.add_argument('--offset', type=int, default=None,
+                        help='number of the most recent jobs to skip')
 
 
 def list_jobs_arg_process(args):
     if args.job_id is not None:
         return {'id': args.job_id}
-    return {'status': args.status}
+    payload = {'status': args.status}
+    if args.limit is not None:
+        payload['limit'] = args.limit
+    if args.offset is not None:
+        payload['offset'] = args.offset
+    return payload
 
 
 def list_jobs_rsp_parse(rsp):
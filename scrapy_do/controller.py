@@ -23,6 +23,7 @@ from twisted.application.service import Service
 from twisted.internet.defer import inlineCallbacks, returnValue
 from twisted.internet.utils import getProcessValue, getProcessOutputAndValue
 from twisted.internet.task import LoopingCall
+from twisted.internet.threads import deferToThread
 from distutils.spawn import find_executable
 from twisted.logger import Logger
 from collections import namedtuple
@@ -39,6 +40,26 @@ Project = namedtuple('Project', ['name', 'archive', 'spiders'])
 RunningJob = namedtuple('RunningJob', ['process', 'finished_d', 'time_started'])
 
 
+#-------------------------------------------------------------------------------
+def _write_temp_file(data):
+    """
+    Store the data in a temporary file and return the path to it.
+    """
+    fd, path = tempfile.mkstemp()
+    with open(fd, 'wb') as f:
+        f.write(data)
+    return path
+
+
+#-------------------------------------------------------------------------------
+def _remove_temp_files(temp_dir, temp_file):
+    """
+    Remove a temporary directory tree and a temporary file.
+    """
+    shutil.rmtree(temp_dir)
+    os.remove(temp_file)
+
+
 #-------------------------------------------------------------------------------
 class Event(Enum):
     """
@@ -176,6 +197,9 @@ class Controller(Service):
     def push_project(self, data):
         """
         Register a project of a given name with the zipped code passed in data.
+        Writing, moving, and removing the archive and the unpacked tree happen
+        in the reactor's thread pool and the external tools run as child
+        processes, so that large archives do not block the reactor.
 
         :param data: Binary blob with a zipped project code
         :return:     A deferred that gets called back with a `Project` object,
@@ -186,9 +210,7 @@ class Controller(Service):
         #-----------------------------------------------------------------------
         # Store the data in a temoporary file
         #-----------------------------------------------------------------------
-        tmp = tempfile.mkstemp()
-        with open(tmp[0], 'wb') as f:
-            f.write(data)
+        tmp_path = yield deferToThread(_write_temp_file, data)
 
         #-----------------------------------------------------------------------
         # Unzip to a temporary directory
@@ -199,10 +221,9 @@ class Controller(Service):
         if unzip is None:
             raise EnvironmentError('Please install unzip')
 
-        ret_code = yield getProcessValue(unzip, args=(tmp[1],), path=temp_dir)
+        ret_code = yield getProcessValue(unzip, args=(tmp_path,), path=temp_dir)
         if ret_code != 0:
-            shutil.rmtree(temp_dir)
-            os.remove(tmp[1])
+            yield deferToThread(_remove_temp_files, temp_dir, tmp_path)
             self.log.debug('Failed to unzip data using "{}"'.format(unzip))
             raise ValueError('Not a valid zip archive')
 
@@ -212,8 +233,7 @@ class Controller(Service):
         config_files = glob(os.path.join(temp_dir, '**/scrapy.cfg'))
 
         if not config_files:
-            shutil.rmtree(temp_dir)
-            os.remove(tmp[1])
+            yield deferToThread(_remove_temp_files, temp_dir, tmp_path)
             raise ValueError('No project found in the archive')
 
         config = configparser.ConfigParser()
@@ -221,14 +241,12 @@ class Controller(Service):
         try:
             name = config.get('deploy', 'project')
         except (configparser.NoOptionError, configparser.NoSectionError):
-            shutil.rmtree(temp_dir)
-            os.remove(tmp[1])
+            yield deferToThread(_remove_temp_files, temp_dir, tmp_path)
             raise ValueError('Can\'t extract project name from the config file')
 
         temp_proj_dir = os.path.join(temp_dir, name)
         if not os.path.exists(temp_proj_dir):
-            shutil.rmtree(temp_dir)
-            os.remove(tmp[1])
+            yield deferToThread(_remove_temp_files, temp_dir, tmp_path)
             raise ValueError('Project {} not found in the archive'.format(name))
 
         scrapy = find_executable('scrapy')
@@ -240,13 +258,12 @@ class Controller(Service):
         out, err, ret_code = ret
 
         if ret_code != 0:
-            shutil.rmtree(temp_dir)
-            os.remove(tmp[1])
+            yield deferToThread(_remove_temp_files, temp_dir, tmp_path)
             raise ValueError('Unable to get the list of spiders')
 
         spiders = out.decode('utf-8').split()
 
-        shutil.rmtree(temp_dir)
+        yield deferToThread(shutil.rmtree, temp_dir)
 
         #-----------------------------------------------------------------------
         # Check if we have had the project registered before and if we
@@ -258,7 +275,7 @@ class Controller(Service):
             sched_spiders = [job.spider for job in sched_jobs]
             for spider in sched_spiders:
                 if spider not in spiders:
-                    os.remove(tmp[1])
+                    yield deferToThread(os.remove, tmp_path)
                     msg = 'Spider {} is going to be removed but has ' \
                           'scheduled jobs'
                     msg = msg.format(spider)
@@ -270,7 +287,7 @@ class Controller(Service):
         # Move to the final position and store the matadata
         #-----------------------------------------------------------------------
         archive = os.path.join(self.project_store, name + '.zip')
-        shutil.move(tmp[1], archive)
+        yield deferToThread(shutil.move, tmp_path, archive)
         prj = Project(name, archive, spiders)
         self.projects[name] = prj
         with open(self.metadata_path, 'wb') as f:
@@ -350,27 +367,27 @@ class Controller(Service):
         return job.identifier
 
     #---------------------------------------------------------------------------
-    def get_jobs(self, job_status):
+    def get_jobs(self, job_status, limit=None, offset=0):
         """
         See :meth:`Schedule.get_jobs <scrapy_do.schedule.Schedule.get_jobs>`.
         """
-        return self.schedule.get_jobs(job_status)
+        return self.schedule.get_jobs(job_status, limit, offset)
 
     #---------------------------------------------------------------------------
-    def get_active_jobs(self):
+    def get_active_jobs(self, limit=None, offset=0):
         """
         See :meth:`Schedule.get_active_jobs
         <scrapy_do.schedule.Schedule.get_active_jobs>`.
         """
-        return self.schedule.get_active_jobs()
+        return self.schedule.get_active_jobs(limit, offset)
 
     #---------------------------------------------------------------------------
-    def get_completed_jobs(self):
+    def get_completed_jobs(self, limit=None, offset=0):
         """
         See :meth:`Schedule.get_completed_jobs
         <scrapy_do.schedule.Schedule.get_completed_jobs>`.
         """
-        return self.schedule.get_completed_jobs()
+        return self.schedule.get_completed_jobs(limit, offset)
 
     #---------------------------------------------------------------------------
     def get_job(self, job_id):
@@ -623,7 +640,7 @@ class Controller(Service):
         """
         Purge all the old jobs exceeding the completed cap.
         """
-        old_jobs = self.get_completed_jobs()[self.completed_cap:]
+        old_jobs = self.get_completed_jobs(offset=self.completed_cap)
 
         if len(old_jobs):
             self.log.info('Purging {} old jobs'.format(len(old_jobs)))
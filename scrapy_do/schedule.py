@@ -100,6 +100,14 @@ class Job:
         return d
 
 
+#-------------------------------------------------------------------------------
+def _sql_limit(limit):
+    """
+    Convert a limit to an SQLite LIMIT value; negative values mean no limit.
+    """
+    return -1 if limit is None else limit
+
+
 #-------------------------------------------------------------------------------
 def _record_to_job(x):
     job = Job(status=Status(x[1]), actor=Actor(x[2]), schedule=x[3],
@@ -209,40 +217,47 @@ class Schedule:
         return response[key]
 
     #---------------------------------------------------------------------------
-    def get_jobs(self, job_status):
+    def get_jobs(self, job_status, limit=None, offset=0):
         """
         Retrieve a list of jobs with a given status
 
         :param job_status: One of :class:`statuses <Status>`
+        :param limit:      Maximum number of jobs to retrieve, all of them if
+                           `None`
+        :param offset:     Number of the most recent jobs to skip
         """
-        query = "SELECT * FROM schedule WHERE status=? ORDER BY timestamp DESC"
-        response = self.db.execute(query, (job_status.value, ))
+        query = "SELECT * FROM schedule WHERE status=? " \
+                "ORDER BY timestamp DESC LIMIT ? OFFSET ?"
+        response = self.db.execute(query, (job_status.value,
+                                           _sql_limit(limit), offset))
         return [_record_to_job(rec) for rec in response]
 
     #---------------------------------------------------------------------------
-    def get_active_jobs(self):
+    def get_active_jobs(self, limit=None, offset=0):
         """
         Retrieve all the active jobs. Ie. all the jobs whose status is one of
         the following: :data:`SCHEDULED <Status.SCHEDULED>`,
         :data:`PENDING <Status.PENDING>`, or :data:`RUNNING <Status.RUNNING>`.
+        See :meth:`get_jobs` for the meaning of `limit` and `offset`.
         """
         query = "SELECT * FROM schedule WHERE " \
                 "status=1 OR status=2 OR status=3 "\
-                "ORDER BY timestamp DESC"
-        response = self.db.execute(query)
+                "ORDER BY timestamp DESC LIMIT ? OFFSET ?"
+        response = self.db.execute(query, (_sql_limit(limit), offset))
         return [_record_to_job(rec) for rec in response]
 
     #---------------------------------------------------------------------------
-    def get_completed_jobs(self):
+    def get_completed_jobs(self, limit=None, offset=0):
         """
         Retrieve all the completed jobs. Ie. all the jobs whose status is one of
         the  following: :data:`SUCCESSFUL <Status.SUCCESSFUL>`,
         :data:`FAILED <Status.FAILED>`, or :data:`CANCELED <Status.CANCELED>`.
+        See :meth:`get_jobs` for the meaning of `limit` and `offset`.
         """
         query = "SELECT * FROM schedule WHERE " \
                 "status=4 OR status=5 OR status=6 "\
-                "ORDER BY timestamp DESC"
-        response = self.db.execute(query)
+                "ORDER BY timestamp DESC LIMIT ? OFFSET ?"
+        response = self.db.execute(query, (_sql_limit(limit), offset))
         return [_record_to_job(rec) for rec in response]
 
     #---------------------------------------------------------------------------
@@ -10,11 +10,12 @@ import json
 import time
 import psutil
 import socket
+import functools
 import mimetypes
 
 from autobahn.twisted.resource import WebSocketResource
 from dateutil.relativedelta import relativedelta
-from twisted.internet.defer import inlineCallbacks
+from twisted.internet.defer import ensureDeferred, maybeDeferred
 from twisted.cred.checkers import FilePasswordDB
 from twisted.web.resource import IResource
 from twisted.cred.portal import IRealm, Portal
@@ -26,29 +27,149 @@ from zope.interface import implementer
 from twisted.web import resource
 from .websocket import WSFactory, WSProtocol
 from .schedule import Status as JobStatus
+from .schedule import Job
 from scrapy_do import __version__
 from datetime import datetime
 from pkgutil import get_data
 from .utils import arg_require_all, arg_require_any, pprint_relativedelta
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+#-------------------------------------------------------------------------------
+def _json_default(obj):
+    """
+    Convert the objects that the JSON encoders do not handle natively.
+    """
+    if isinstance(obj, Job):
+        return obj.to_dict()
+    raise TypeError('Object of type {} is not JSON serializable'.format(
+        type(obj).__name__))
+
+
+#-------------------------------------------------------------------------------
+def encode_json(data):
+    """
+    Serialize the data to a newline-terminated UTF-8 encoded JSON document.
+    :class:`Job <scrapy_do.schedule.Job>` objects are serialized using their
+    dictionary representation.
+    """
+    if orjson is not None:
+        return orjson.dumps(data, default=_json_default,
+                            option=orjson.OPT_APPEND_NEWLINE)
+    json_data = json.dumps(data, ensure_ascii=False, default=_json_default)
+    return json_data.encode('utf-8') + b'\n'
+
+
+#-------------------------------------------------------------------------------
+@functools.lru_cache(maxsize=128)
+def encode_error(msg):
+    """
+    Serialize an error response carrying the message. The results are cached,
+    so that a failure repeating the same error is not serialized every time.
+    """
+    return encode_json({'status': 'error', 'msg': msg})
+
+
+#-------------------------------------------------------------------------------
+# Pre-serialized responses
+#-------------------------------------------------------------------------------
+OK_RESPONSE = encode_json({'status': 'ok'})
+ERR_MISSING_ARCHIVE = encode_error("Missing argument: b'archive'")
+ERR_MISSING_ID = encode_error("Missing argument: b'id'")
+
+#-------------------------------------------------------------------------------
+# Arguments required by the web services
+#-------------------------------------------------------------------------------
+LIST_SPIDERS_ARGS = (b'project',)
+SCHEDULE_JOB_ARGS = (b'project', b'spider', b'when')
+LIST_JOBS_ARGS = (b'status', b'id')
+LIST_JOBS_LIMIT = 500
+REMOVE_PROJECT_ARGS = (b'name',)
+
+
+#-------------------------------------------------------------------------------
+class ResponseCache:
+    """
+    A store of serialized responses. The entries expire after `ttl` seconds,
+    so that changes to the state of the controller made by means other than
+    the web services eventually become visible.
+
+    :param ttl: Lifetime of the cache entries in seconds
+    """
+
+    #---------------------------------------------------------------------------
+    def __init__(self, ttl=2.):
+        self.ttl = ttl
+        self.entries = {}
+
+    #---------------------------------------------------------------------------
+    def get(self, key):
+        """
+        Get the data stored under `key` or `None` if there is no such data or
+        if it has expired.
+        """
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        data, expires = entry
+        if time.monotonic() >= expires:
+            del self.entries[key]
+            return None
+        return data
+
+    #---------------------------------------------------------------------------
+    def put(self, key, data):
+        """
+        Store the data under `key`.
+        """
+        self.entries[key] = (data, time.monotonic() + self.ttl)
+
+    #---------------------------------------------------------------------------
+    def clear(self):
+        """
+        Drop all the entries.
+        """
+        self.entries.clear()
+
+
+#-------------------------------------------------------------------------------
+def load_web_modules(config):
+    """
+    Resolve the classes of the web modules listed in the `web-modules` section
+    of the configuration.
+
+    :return: A list of tuples containing the UTF-8 encoded module path and
+             the module class
+    """
+    web_modules = []
+    for mod_name, mod_class_name in config.get_options('web-modules'):
+        mod_class = get_object(mod_class_name)
+        web_modules.append((mod_name.encode('utf-8'), mod_class))
+    return web_modules
+
 
 #-------------------------------------------------------------------------------
 class WebApp(resource.Resource):
     #---------------------------------------------------------------------------
-    def __init__(self, config, controller):
+    def __init__(self, config, controller, web_modules=None):
         super(WebApp, self).__init__()
         self.config = config
         self.controller = controller
         self.children = {}
+        self.response_cache = ResponseCache()
 
         #-----------------------------------------------------------------------
         # Register web modules
         #-----------------------------------------------------------------------
-        web_modules = config.get_options('web-modules')
+        if web_modules is None:
+            web_modules = load_web_modules(config)
 
-        for mod_name, mod_class_name in web_modules:
-            mod_class = get_object(mod_class_name)
-            self.putChild(mod_name.encode('utf-8'), mod_class(self))
+        for mod_name, mod_class in web_modules:
+            self.putChild(mod_name, mod_class(self))
 
         #-----------------------------------------------------------------------
         # Set up the websocket
@@ -129,69 +250,121 @@ class UIResource(resource.Resource):
 class JsonResource(resource.Resource):
 
     isLeaf = True
+    CONTENT_TYPE = (b'application/json',)
+    ALLOW_ORIGIN = (b'*',)
 
     #---------------------------------------------------------------------------
     def __init__(self, parent):
         super(JsonResource, self).__init__()
         self.parent = parent
 
+        #-----------------------------------------------------------------------
+        # Map the HTTP methods to their handlers up front, so that the dispatch
+        # does not need to build the handler name for every request
+        #-----------------------------------------------------------------------
+        self.method_handlers = {}
+        for name in dir(self):
+            if not name.startswith('render_'):
+                continue
+            method = name[len('render_'):]
+            if method.isupper():
+                handler = getattr(self, name)
+                self.method_handlers[method.encode('ascii')] = handler
+
     #---------------------------------------------------------------------------
-    def render_json(self, request, data):
-        json_data = json.dumps(data, ensure_ascii=False) + '\n'
-        json_data = json_data.encode('utf-8')
-        request.setHeader('Content-Type', 'application/json')
-        request.setHeader('Content-Length', str(len(json_data)))
-        request.setHeader('Access-Control-Allow-Origin', '*')
+    def encoded_response(self, request, json_data):
+        headers = request.responseHeaders
+        headers.setRawHeaders(b'content-type', self.CONTENT_TYPE)
+        headers.setRawHeaders(b'content-length', (b'%d' % len(json_data),))
+        headers.setRawHeaders(b'access-control-allow-origin',
+                              self.ALLOW_ORIGIN)
         return json_data
 
+    #---------------------------------------------------------------------------
+    def render_json(self, request, data):
+        return self.encoded_response(request, encode_json(data))
+
+    #---------------------------------------------------------------------------
+    def cached_response(self, request, key, get_data):
+        """
+        Render a successful response stored in the response cache of the
+        parent under `key`. If there is no such response, `get_data` is called
+        to produce the dictionary to be serialized and cached.
+        """
+        cache = self.parent.response_cache
+        json_data = cache.get(key)
+        if json_data is None:
+            data = get_data()
+            data['status'] = 'ok'
+            json_data = encode_json(data)
+            cache.put(key, json_data)
+        return self.encoded_response(request, json_data)
+
     #---------------------------------------------------------------------------
     def render(self, request):
         try:
-            data = super(JsonResource, self).render(request)
+            handler = self.method_handlers.get(request.method)
+            if handler is not None:
+                data = handler(request)
+            else:
+                data = super(JsonResource, self).render(request)
             if data == NOT_DONE_YET:
                 return data
-            data = {
-                **{'status': 'ok'},
-                **data
-            }
+            if isinstance(data, bytes):
+                return data
+            #-------------------------------------------------------------------
+            # The handler results are serialized right away, so the status is
+            # injected in place
+            #-------------------------------------------------------------------
+            if 'status' not in data:
+                data['status'] = 'ok'
             return self.render_json(request, data)
         except Exception as e:
             request.setResponseCode(400)
-            data = {
-                'status': 'error',
-                'msg': str(e)
-            }
-            return self.render_json(request, data)
+            return self.encoded_response(request, encode_error(str(e)))
 
 
 #-------------------------------------------------------------------------------
 class Status(JsonResource):
 
     #---------------------------------------------------------------------------
-    def render_GET(self, request):
-        p = psutil.Process(os.getpid())
-        controller = self.parent.controller
-        uptime = relativedelta(datetime.now(), controller.start_time)
-        all_spiders = \
-            [spider
-             for _, prj in controller.projects.items()
-             for spider in prj.spiders]
-        resp = {
-            'memory-usage': float(p.memory_info().rss) / 1024. / 1024.,
-            'cpu-usage': p.cpu_percent(),
-            'time': str(datetime.now()),
+    def __init__(self, parent):
+        super(Status, self).__init__(parent)
+        #-----------------------------------------------------------------------
+        # The CPU usage is computed relative to the previous call on the same
+        # process object, so it needs to be kept around
+        #-----------------------------------------------------------------------
+        self.process = psutil.Process(os.getpid())
+
+        #-----------------------------------------------------------------------
+        # The response dictionary is reused, only the values that may change
+        # are updated on each request
+        #-----------------------------------------------------------------------
+        self.response = {
             'timezone': "{}; {}".format(time.tzname[0], time.tzname[1]),
-            'hostname': socket.gethostname(),
-            'uptime': pprint_relativedelta(uptime),
-            'jobs-run': controller.counter_run,
-            'jobs-successful': controller.counter_success,
-            'jobs-failed': controller.counter_failure,
-            'jobs-canceled': controller.counter_cancel,
-            'jobs-scheduled': len(controller.scheduled_jobs),
-            'projects': len(controller.projects),
-            'spiders': len(all_spiders),
             'daemon-version': __version__,
         }
+
+    #---------------------------------------------------------------------------
+    def render_GET(self, request):
+        p = self.process
+        controller = self.parent.controller
+        uptime = relativedelta(datetime.now(), controller.start_time)
+        num_spiders = sum(len(prj.spiders)
+                          for prj in controller.projects.values())
+        resp = self.response
+        resp['memory-usage'] = float(p.memory_info().rss) / 1024. / 1024.
+        resp['cpu-usage'] = p.cpu_percent()
+        resp['time'] = str(datetime.now())
+        resp['hostname'] = socket.gethostname()
+        resp['uptime'] = pprint_relativedelta(uptime)
+        resp['jobs-run'] = controller.counter_run
+        resp['jobs-successful'] = controller.counter_success
+        resp['jobs-failed'] = controller.counter_failure
+        resp['jobs-canceled'] = controller.counter_cancel
+        resp['jobs-scheduled'] = len(controller.scheduled_jobs)
+        resp['projects'] = len(controller.projects)
+        resp['spiders'] = num_spiders
         return resp
 
 
@@ -200,36 +373,39 @@ class PushProject(JsonResource):
 
     #---------------------------------------------------------------------------
     def render_POST(self, request):
-        @inlineCallbacks
-        def do_async():
+        async def do_async():
+            #-------------------------------------------------------------------
+            # Twisted parses the multipart body into request.args before the
+            # resource is rendered, so this only takes a reference to the
+            # archive; the controller writes it to disk in a worker thread
+            #-------------------------------------------------------------------
             try:
                 data = request.args[b'archive'][0]
-            except KeyError as e:
-                result = {
-                    'status': 'error',
-                    'msg': 'Missing argument: ' + str(e)
-                }
+            except KeyError:
                 request.setResponseCode(400)
-                request.write(self.render_json(request, result))
+                json_data = self.encoded_response(request, ERR_MISSING_ARCHIVE)
+                request.write(json_data)
                 request.finish()
                 return
 
             try:
                 controller = self.parent.controller
 
-                project = yield controller.push_project(data)
+                project = await maybeDeferred(controller.push_project, data)
+                self.parent.response_cache.clear()
                 result = {
                     'status': 'ok',
                     'name': project.name,
                     'spiders': project.spiders
                 }
+                json_data = encode_json(result)
             except Exception as e:
                 request.setResponseCode(400)
-                result = {'status': 'error', 'msg': str(e)}
+                json_data = encode_error(str(e))
 
-            request.write(self.render_json(request, result))
+            request.write(self.encoded_response(request, json_data))
             request.finish()
-        do_async()
+        ensureDeferred(do_async())
         return NOT_DONE_YET
 
 
@@ -238,8 +414,9 @@ class ListProjects(JsonResource):
 
     #---------------------------------------------------------------------------
     def render_GET(self, request):
-        projects = self.parent.controller.get_projects()
-        return {'projects': projects}
+        def get_data():
+            return {'projects': self.parent.controller.get_projects()}
+        return self.cached_response(request, ('list-projects',), get_data)
 
 
 #-------------------------------------------------------------------------------
@@ -247,11 +424,14 @@ class ListSpiders(JsonResource):
 
     #---------------------------------------------------------------------------
     def render_GET(self, request):
-        arg_require_all(request.args, [b'project'])
+        arg_require_all(request.args, LIST_SPIDERS_ARGS)
         project = request.args[b'project'][0].decode('utf-8')
 
-        spiders = self.parent.controller.get_spiders(project)
-        return {'project': project, 'spiders': spiders}
+        def get_data():
+            spiders = self.parent.controller.get_spiders(project)
+            return {'project': project, 'spiders': spiders}
+        key = ('list-spiders', project)
+        return self.cached_response(request, key, get_data)
 
 
 #-------------------------------------------------------------------------------
@@ -259,7 +439,7 @@ class ScheduleJob(JsonResource):
 
     #---------------------------------------------------------------------------
     def render_POST(self, request):
-        arg_require_all(request.args, [b'project', b'spider', b'when'])
+        arg_require_all(request.args, SCHEDULE_JOB_ARGS)
         project = request.args[b'project'][0].decode('utf-8')
         spider = request.args[b'spider'][0].decode('utf-8')
         when = request.args[b'when'][0].decode('utf-8')
@@ -283,21 +463,27 @@ class ListJobs(JsonResource):
 
     #---------------------------------------------------------------------------
     def render_GET(self, request):
-        arg_require_any(request.args, [b'status', b'id'])
+        arg_require_any(request.args, LIST_JOBS_ARGS)
         if b'status' in request.args:
             status = request.args[b'status'][0].decode('utf-8')
+            limit = int(request.args.get(b'limit', [LIST_JOBS_LIMIT])[0])
+            offset = int(request.args.get(b'offset', [0])[0])
+            if limit < 0 or offset < 0:
+                raise ValueError('Limit and offset must not be negative')
+
+            controller = self.parent.controller
             if status == 'ACTIVE':
-                jobs = self.parent.controller.get_active_jobs()
+                jobs = controller.get_active_jobs(limit, offset)
             elif status == 'COMPLETED':
-                jobs = self.parent.controller.get_completed_jobs()
+                jobs = controller.get_completed_jobs(limit, offset)
             else:
                 status = JobStatus[status]
-                jobs = self.parent.controller.get_jobs(status)
+                jobs = controller.get_jobs(status, limit, offset)
         else:
             identifier = request.args[b'id'][0].decode('utf-8')
             jobs = [self.parent.controller.get_job(identifier)]
 
-        return {'jobs': [job.to_dict() for job in jobs]}
+        return {'jobs': jobs}
 
 
 #-------------------------------------------------------------------------------
@@ -305,32 +491,27 @@ class CancelJob(JsonResource):
 
     #---------------------------------------------------------------------------
     def render_POST(self, request):
-        @inlineCallbacks
-        def do_async():
+        async def do_async():
             try:
                 job_id = request.args[b'id'][0].decode('utf-8')
-            except KeyError as e:
-                result = {
-                    'status': 'error',
-                    'msg': 'Missing argument: ' + str(e)
-                }
+            except KeyError:
                 request.setResponseCode(400)
-                request.write(self.render_json(request, result))
+                request.write(self.encoded_response(request, ERR_MISSING_ID))
                 request.finish()
                 return
 
             try:
                 controller = self.parent.controller
 
-                yield controller.cancel_job(job_id)
-                result = {'status': 'ok'}
+                await maybeDeferred(controller.cancel_job, job_id)
+                json_data = OK_RESPONSE
             except Exception as e:
                 request.setResponseCode(400)
-                result = {'status': 'error', 'msg': str(e)}
+                json_data = encode_error(str(e))
 
-            request.write(self.render_json(request, result))
+            request.write(self.encoded_response(request, json_data))
             request.finish()
-        do_async()
+        ensureDeferred(do_async())
         return NOT_DONE_YET
 
 
@@ -351,9 +532,10 @@ class RemoveProject(JsonResource):
 
     #---------------------------------------------------------------------------
     def render_POST(self, request):
-        arg_require_all(request.args, [b'name'])
+        arg_require_all(request.args, REMOVE_PROJECT_ARGS)
         name = request.args[b'name'][0].decode('utf-8')
         self.parent.controller.remove_project(name)
+        self.parent.response_cache.clear()
         return {}
 
 
@@ -362,28 +544,51 @@ class RemoveProject(JsonResource):
 class PublicHTMLRealm:
 
     #---------------------------------------------------------------------------
-    def __init__(self, config, controller):
+    def __init__(self, config, controller, web_modules=None):
         super(PublicHTMLRealm, self).__init__()
         self.config = config
         self.controller = controller
+        self.web_modules = web_modules
+        self.web_app = None
 
     #---------------------------------------------------------------------------
     def requestAvatar(self, avatar_id, mind, *interfaces):
         if IResource in interfaces:
-            return (IResource, WebApp(self.config, self.controller),
-                    lambda: None)
+            #-------------------------------------------------------------------
+            # The web app holds no per-user state, so all the authenticated
+            # requests share one instance
+            #-------------------------------------------------------------------
+            if self.web_app is None:
+                self.web_app = WebApp(self.config, self.controller,
+                                      self.web_modules)
+            return (IResource, self.web_app, lambda: None)
         raise NotImplementedError()
 
 
 #-------------------------------------------------------------------------------
 def get_web_app(config, controller):
+    #---------------------------------------------------------------------------
+    # Resolve the web modules at startup, so that configuration errors surface
+    # right away even if the web app is only built on the first request
+    #---------------------------------------------------------------------------
+    web_modules = load_web_modules(config)
+
     auth = config.get_bool('web', 'auth', False)
     if auth:
         auth_file = config.get_string('web', 'auth-db')
-        portal = Portal(PublicHTMLRealm(config, controller),
-                        [FilePasswordDB(auth_file)])
+        #-----------------------------------------------------------------------
+        # Keep the parsed credentials in memory; the checker re-reads the file
+        # only when its modification time changes
+        #-----------------------------------------------------------------------
+        checker = FilePasswordDB(auth_file, cache=True)
+        realm = PublicHTMLRealm(config, controller, web_modules)
+        portal = Portal(realm, [checker])
+        #-----------------------------------------------------------------------
+        # Twisted implements only md5, md5-sess and sha (SHA-1) digests; SHA-256
+        # from RFC 7616 is not available, and md5 is what the browsers support
+        #-----------------------------------------------------------------------
         credential_factory = DigestCredentialFactory('md5', b'scrapy-do')
         resource = HTTPAuthSessionWrapper(portal, [credential_factory])
         return resource
 
-    return WebApp(config, controller)
+    return WebApp(config, controller, web_modules)
@@ -11,7 +11,9 @@ import os
 
 from twisted.application.service import MultiService
 from twisted.internet.defer import inlineCallbacks
-from scrapy_do.webservice import PublicHTMLRealm, get_web_app
+from twisted.web.resource import IResource
+from twisted.cred.credentials import IUsernamePassword
+from scrapy_do.webservice import PublicHTMLRealm, Status, get_web_app
 from twisted.trial import unittest
 from scrapy_do.app import ScrapyDoServiceMaker
 from unittest.mock import Mock, patch
@@ -241,11 +243,24 @@ class AppAuthTest(AppTestBase):
         self.assertRaises(NotImplementedError, realm.requestAvatar,
                           avatar_id='foo', mind='bar')
 
+        with patch('scrapy_do.webservice.WebApp') as web_app:
+            _, avatar1, _ = realm.requestAvatar('foo', 'bar', IResource)
+            _, avatar2, _ = realm.requestAvatar('baz', 'bar', IResource)
+        self.assertIs(avatar1, avatar2)
+        web_app.assert_called_once_with(config, controller, None)
+
     #---------------------------------------------------------------------------
     def test_site(self):
         config = Mock()
+        config.get_options.return_value = [
+            ('status.json', 'scrapy_do.webservice.Status')
+        ]
         controller = Mock()
-        get_web_app(config, controller)
+        resource = get_web_app(config, controller)
+        checker = resource._portal.checkers[IUsernamePassword]
+        self.assertTrue(checker.cache)
+        self.assertEqual(resource._portal.realm.web_modules,
+                         [(b'status.json', Status)])
 
     #---------------------------------------------------------------------------
     def tearDown(self):
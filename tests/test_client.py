@@ -185,9 +185,18 @@ class ClientTests(unittest.TestCase):
         args = Mock()
         args.status = 'foo'
         args.job_id = None
+        args.limit = None
+        args.offset = None
         payload = cmd.list_jobs_arg_process(args)
         self.assertIn('status', payload)
         self.assertEqual(payload['status'], 'foo')
+        self.assertNotIn('limit', payload)
+        self.assertNotIn('offset', payload)
+        args.limit = 10
+        args.offset = 20
+        payload = cmd.list_jobs_arg_process(args)
+        self.assertEqual(payload['limit'], 10)
+        self.assertEqual(payload['offset'], 20)
         args.job_id = 'foo'
         payload = cmd.list_jobs_arg_process(args)
         self.assertIn('id', payload)
@@ -18,6 +18,7 @@ from scrapy_do.utils import twisted_sleep, run_process
 from distutils.spawn import find_executable
 from unittest.mock import Mock, patch, DEFAULT
 from twisted.trial import unittest
+from datetime import datetime
 
 
 #-------------------------------------------------------------------------------
@@ -567,6 +568,31 @@ class ControllerTests(unittest.TestCase):
             log_file = os.path.join(controller.log_dir, job.identifier + '.err')
             self.assertFalse(os.path.exists(log_file))
 
+    #---------------------------------------------------------------------------
+    def test_purge_completed_cap(self):
+        controller = self.controller
+        controller.completed_cap = 3
+        completed = []
+        for i in range(5):
+            job = Job(Status.SUCCESSFUL, Actor.USER, schedule='now',
+                      project='quotesbot', spider='toscrape-css',
+                      timestamp=datetime(2020, 1, 1, 0, 0, i))
+            controller.schedule.add_job(job)
+            completed.append(job.identifier)
+        active = Job(Status.PENDING, Actor.USER, schedule='now',
+                     project='quotesbot', spider='toscrape-css',
+                     timestamp=datetime(2019, 1, 1))
+        controller.schedule.add_job(active)
+
+        controller.purge_completed_jobs()
+        remaining = [job.identifier for job in controller.get_completed_jobs()]
+        self.assertEqual(remaining, completed[:1:-1])
+        self.assertEqual(controller.get_job(active.identifier).identifier,
+                         active.identifier)
+
+        controller.purge_completed_jobs()
+        self.assertEqual(len(controller.get_completed_jobs()), 3)
+
     #---------------------------------------------------------------------------
     @inlineCallbacks
     def test_remove_project(self):
@@ -95,8 +95,26 @@ class ScheduleTests(unittest.TestCase):
         with self.assertRaises(ValueError):
             self.schedule.get_job(identifier=scheduled_jobs[0].identifier + 'a')
 
+        limited_jobs = self.schedule.get_jobs(Status.SCHEDULED, limit=1)
+        self.assertEqual(len(limited_jobs), 1)
+        self.compare_jobs(limited_jobs[0], scheduled_jobs[0])
+        offset_jobs = self.schedule.get_jobs(Status.SCHEDULED, offset=1)
+        self.assertEqual(len(offset_jobs), 1)
+        self.compare_jobs(offset_jobs[0], scheduled_jobs[1])
+
         active_jobs = self.schedule.get_active_jobs()
         completed_jobs = self.schedule.get_completed_jobs()
+        self.assertEqual(len(self.schedule.get_active_jobs(limit=0)), 0)
+        self.assertEqual(len(self.schedule.get_active_jobs(offset=1)),
+                         len(active_jobs) - 1)
+        self.assertEqual(len(completed_jobs), 4)
+        limited_jobs = self.schedule.get_completed_jobs(limit=2)
+        self.assertEqual(len(limited_jobs), 2)
+        for job1, job2 in zip(limited_jobs, completed_jobs[:2]):
+            self.compare_jobs(job1, job2)
+        offset_jobs = self.schedule.get_completed_jobs(limit=2, offset=3)
+        self.assertEqual(len(offset_jobs), 1)
+        self.compare_jobs(offset_jobs[0], completed_jobs[3])
 
         for job in active_jobs:
             self.assertIn(job.status,
@@ -11,7 +11,7 @@ import uuid
 from twisted.internet.defer import Deferred, inlineCallbacks
 from scrapy_do.webservice import Status, PushProject, ListProjects, ListSpiders
 from scrapy_do.webservice import ScheduleJob, ListJobs, CancelJob, RemoveProject
-from scrapy_do.webservice import WebApp
+from scrapy_do.webservice import WebApp, ResponseCache
 from scrapy_do.controller import Project
 from twisted.web.server import NOT_DONE_YET
 from scrapy_do.schedule import Job, Actor
@@ -27,6 +27,7 @@ class WebServicesTests(unittest.TestCase):
     #---------------------------------------------------------------------------
     def setUp(self):
         self.web_app = Mock()
+        self.web_app.response_cache = ResponseCache()
         self.web_app.controller.get_projects.return_value = ['quotesbot']
 
         #-----------------------------------------------------------------------
@@ -77,7 +78,7 @@ class WebServicesTests(unittest.TestCase):
     def test_status(self):
         service = Status(self.web_app)
         request = Mock()
-        request.method = 'GET'
+        request.method = b'GET'
         retval = service.render(request)
         decoded = json.loads(retval)
         keys = ['memory-usage', 'cpu-usage', 'time', 'timezone', 'hostname',
@@ -86,6 +87,24 @@ class WebServicesTests(unittest.TestCase):
                 'daemon-version']
         for key in keys:
             self.assertIn(key, decoded)
+        self.assertEqual(decoded['spiders'], 3)
+
+        self.web_app.controller.counter_run = 5
+        decoded = json.loads(service.render(request))
+        self.assertEqual(decoded['status'], 'ok')
+        self.assertEqual(decoded['jobs-run'], 5)
+
+    #---------------------------------------------------------------------------
+    def test_render_json_fallback(self):
+        service = ListProjects(self.web_app)
+        request = Mock()
+        request.method = b'GET'
+        with patch('scrapy_do.webservice.orjson', None):
+            retval = service.render(request)
+        self.assertTrue(retval.endswith(b'\n'))
+        decoded = json.loads(retval)
+        self.assertEqual(decoded['status'], 'ok')
+        self.assertIn('quotesbot', decoded['projects'])
 
     #---------------------------------------------------------------------------
     @inlineCallbacks
@@ -97,7 +116,7 @@ class WebServicesTests(unittest.TestCase):
         web_app.controller = Mock()
         request = Mock()
         request.args = {}
-        request.method = 'POST'
+        request.method = b'POST'
         service = PushProject(web_app)
 
         #-----------------------------------------------------------------------
@@ -110,15 +129,17 @@ class WebServicesTests(unittest.TestCase):
         yield d
 
         code = request.setResponseCode.call_args[0][0]
-        headers = request.setHeader.call_args_list
+        headers = \
+            request.responseHeaders.setRawHeaders.call_args_list
         data = request.write.call_args[0][0].decode('utf-8')
         decoded = json.loads(data)
 
         self.assertEqual(ret, NOT_DONE_YET)
         self.assertEqual(code, 400)
-        self.assertIn((('Content-Type', 'application/json'),), headers)
+        self.assertIn(((b'content-type', (b'application/json',)),), headers)
         self.assertIn('status', decoded)
         self.assertEqual(decoded['status'], 'error')
+        self.assertEqual(decoded['msg'], "Missing argument: b'archive'")
 
         #-----------------------------------------------------------------------
         # Test controller error
@@ -172,13 +193,54 @@ class WebServicesTests(unittest.TestCase):
     def test_list_projects(self):
         service = ListProjects(self.web_app)
         request = Mock()
-        request.method = 'GET'
+        request.method = b'GET'
         retval = service.render(request)
         decoded = json.loads(retval)
         self.assertIn('status', decoded)
         self.assertIn('projects', decoded)
         self.assertIn('quotesbot', decoded['projects'])
 
+        self.web_app.controller.get_projects.return_value = ['foo']
+        self.assertEqual(service.render(request), retval)
+        self.web_app.response_cache.clear()
+        decoded = json.loads(service.render(request))
+        self.assertEqual(decoded['projects'], ['foo'])
+
+    #---------------------------------------------------------------------------
+    def test_method_dispatch(self):
+        service = ListProjects(self.web_app)
+        self.assertIn(b'GET', service.method_handlers)
+        self.assertNotIn(b'POST', service.method_handlers)
+
+        request = Mock()
+        request.method = b'HEAD'
+        decoded = json.loads(service.render(request))
+        self.assertEqual(decoded['status'], 'ok')
+
+        request = Mock()
+        request.method = b'POST'
+        decoded = json.loads(service.render(request))
+        self.assertEqual(decoded['status'], 'error')
+        self.assertEqual(request.setResponseCode.call_args[0][0], 400)
+        self.assertTrue(decoded['msg'].startswith('Expected one of'))
+        self.assertIn("b'GET'", decoded['msg'])
+        self.assertNotIn("b'encoded'", decoded['msg'])
+        self.assertNotIn("b'cached'", decoded['msg'])
+
+    #---------------------------------------------------------------------------
+    def test_response_cache(self):
+        cache = ResponseCache()
+        self.assertIsNone(cache.get('foo'))
+        cache.put('foo', b'bar')
+        self.assertEqual(cache.get('foo'), b'bar')
+        cache.clear()
+        self.assertIsNone(cache.get('foo'))
+
+        cache = ResponseCache(ttl=0)
+        cache.put('foo', b'bar')
+        self.assertIsNone(cache.get('foo'))
+        self.assertNotIn('foo', cache.entries)
+
     #---------------------------------------------------------------------------
     def test_list_spiders(self):
         #-----------------------------------------------------------------------
@@ -186,7 +248,7 @@ class WebServicesTests(unittest.TestCase):
         #-----------------------------------------------------------------------
         service = ListSpiders(self.web_app)
         request = Mock()
-        request.method = 'GET'
+        request.method = b'GET'
         request.args = {b'proj': [b'']}
         retval = service.render(request)
         decoded = json.loads(retval)
@@ -222,7 +284,7 @@ class WebServicesTests(unittest.TestCase):
         }
 
         request = Mock()
-        request.method = 'POST'
+        request.method = b'POST'
         request.args = {
             b'project': [b'quotesbot'],
             b'spider': [b'toscrap-css'],
@@ -244,7 +306,7 @@ class WebServicesTests(unittest.TestCase):
         #-----------------------------------------------------------------------
         service = ListJobs(self.web_app)
         request = Mock()
-        request.method = 'GET'
+        request.method = b'GET'
         request.args = {}
         retval = service.render(request)
         decoded = json.loads(retval)
@@ -258,7 +320,7 @@ class WebServicesTests(unittest.TestCase):
         #-----------------------------------------------------------------------
         service = ListJobs(self.web_app)
         request = Mock()
-        request.method = 'GET'
+        request.method = b'GET'
         job_id = self.job1.identifier
         request.args = {b'id': [job_id.encode('utf-8')]}
         retval = service.render(request)
@@ -277,7 +339,7 @@ class WebServicesTests(unittest.TestCase):
         #-----------------------------------------------------------------------
         service = ListJobs(self.web_app)
         request = Mock()
-        request.method = 'GET'
+        request.method = b'GET'
         request.args = {b'status': ['PENDING'.encode('utf-8')]}
         retval = service.render(request)
         decoded = json.loads(retval)
@@ -288,7 +350,22 @@ class WebServicesTests(unittest.TestCase):
         self.assertEqual(len(jobs), 1)
         self.assertEqual(jobs[0]['identifier'], self.job2.identifier)
         self.assertEqual(jobs[0]['schedule'], self.job2.schedule)
-        self.web_app.controller.get_jobs.assert_called_with(JobStatus.PENDING)
+        self.web_app.controller.get_jobs.assert_called_with(JobStatus.PENDING,
+                                                            500, 0)
+
+        #-----------------------------------------------------------------------
+        # List jobs with limit and offset
+        #-----------------------------------------------------------------------
+        request.args = {b'status': [b'PENDING'], b'limit': [b'10'],
+                        b'offset': [b'20']}
+        decoded = json.loads(service.render(request))
+        self.assertEqual(decoded['status'], 'ok')
+        self.web_app.controller.get_jobs.assert_called_with(JobStatus.PENDING,
+                                                            10, 20)
+
+        request.args = {b'status': [b'PENDING'], b'limit': [b'-1']}
+        decoded = json.loads(service.render(request))
+        self.assertEqual(decoded['status'], 'error')
 
         #-----------------------------------------------------------------------
         # List active and completed jobs
@@ -303,7 +380,7 @@ class WebServicesTests(unittest.TestCase):
         for i in range(len(statuses)):
             service = ListJobs(self.web_app)
             request = Mock()
-            request.method = 'GET'
+            request.method = b'GET'
             request.args = {b'status': [statuses[i].encode('utf-8')]}
             retval = service.render(request)
             decoded = json.loads(retval)
@@ -325,7 +402,7 @@ class WebServicesTests(unittest.TestCase):
         web_app.controller = Mock()
         request = Mock()
         request.args = {}
-        request.method = 'POST'
+        request.method = b'POST'
         service = CancelJob(web_app)
 
         #-----------------------------------------------------------------------
@@ -338,15 +415,17 @@ class WebServicesTests(unittest.TestCase):
         yield d
 
         code = request.setResponseCode.call_args[0][0]
-        headers = request.setHeader.call_args_list
+        headers = \
+            request.responseHeaders.setRawHeaders.call_args_list
         data = request.write.call_args[0][0].decode('utf-8')
         decoded = json.loads(data)
 
         self.assertEqual(ret, NOT_DONE_YET)
         self.assertEqual(code, 400)
-        self.assertIn((('Content-Type', 'application/json'),), headers)
+        self.assertIn(((b'content-type', (b'application/json',)),), headers)
         self.assertIn('status', decoded)
         self.assertEqual(decoded['status'], 'error')
+        self.assertEqual(decoded['msg'], "Missing argument: b'id'")
 
         #-----------------------------------------------------------------------
         # Test a controller error
@@ -395,7 +474,7 @@ class WebServicesTests(unittest.TestCase):
         web_app.controller = Mock()
         request = Mock()
         request.args = {}
-        request.method = 'POST'
+        request.method = b'POST'
         service = RemoveProject(web_app)
         request.args = {b'name': [b'foo']}
         data = service.render(request)